@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LogSeq转换工具的公共函数
+供 logseq_to_notion_converter.py 和 logseq_to_team_template_converter.py 共用：
+目录扫描、页面读取、资源复制以及多进程工作进程的初始化
+"""
+
+import os
+import mmap
+import shutil
+from typing import List, Optional
+
+# 超过该大小（字节）的页面文件通过mmap读取
+MMAP_THRESHOLD = 1024 * 1024
+
+# 超过该大小（字节）的资源文件尝试使用copy_file_range复制
+COPY_FILE_RANGE_THRESHOLD = 128 * 1024
+
+def list_markdown_files(directory: str) -> List[os.DirEntry]:
+    """列出目录下的Markdown文件（目录不存在时返回空列表）
+
+    DirEntry.is_file() 直接使用目录读取时返回的类型信息，不需要额外stat。
+    """
+    try:
+        with os.scandir(directory) as it:
+            return [entry for entry in it
+                    if entry.name.endswith(".md") and entry.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+def walk_files(root: str):
+    """递归遍历root下的所有文件，依次产出DirEntry"""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+def read_page_text(path) -> str:
+    """读取页面文本：以二进制一次性读取后解码，跳过文本模式的逐块解码；
+    大文件通过mmap直接从页缓存解码，省去用户态读缓冲区的拷贝"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size <= MMAP_THRESHOLD:
+            content = f.read().decode('utf-8')
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content = str(mm, 'utf-8')
+    # 与文本模式读取保持一致：统一换行符
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+def copy_asset(source_path: str, target_path: str):
+    """复制资源文件：较大的文件优先使用copy_file_range在内核中复制（支持reflink的文件系统上无需搬运数据），
+    否则退回到shutil.copyfile（Linux上使用sendfile）；元数据单独通过copystat复制"""
+    if hasattr(os, "copy_file_range") and os.path.getsize(source_path) > COPY_FILE_RANGE_THRESHOLD:
+        try:
+            with open(source_path, 'rb') as fsrc, open(target_path, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(source_path, target_path)
+                return
+        except OSError:
+            pass
+
+    shutil.copyfile(source_path, target_path)
+    shutil.copystat(source_path, target_path)
+
+# Windows上ProcessPoolExecutor最多支持61个工作进程
+MAX_POOL_WORKERS = 61
+
+def pool_workers(task_count: int) -> int:
+    """计算进程池的工作进程数：不超过CPU核数、任务数和平台上限"""
+    return max(1, min(os.cpu_count() or 1, task_count, MAX_POOL_WORKERS))
+
+# 工作进程中的转换器副本，由 init_worker 在每个进程启动时设置一次
+_worker_converter: Optional[object] = None
+
+def init_worker(converter):
+    """工作进程初始化：保存转换器副本，避免每个任务重复传递配置和页面映射"""
+    global _worker_converter
+    _worker_converter = converter
+
+def worker_converter():
+    """获取当前工作进程中的转换器副本"""
+    return _worker_converter
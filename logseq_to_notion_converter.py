@@ -7,17 +7,63 @@ LogSeq to Notion 转换工具
 
 import os
 import re
-import uuid
+import copy
+import multiprocessing
 import shutil
 import json
+import time
+import functools
+import queue
+import threading
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.parse import quote
 from datetime import datetime
 from typing import Dict, List, Set, Tuple, Optional
 
+from logseq_common import (copy_asset, init_worker, list_markdown_files, pool_workers, read_page_text,
+                           walk_files, worker_converter)
+
+try:
+    # 可选依赖：pyahocorasick，用于已知页面链接的快速替换
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    # 可选依赖：orjson，用于快速生成转换报告
+    import orjson
+except ImportError:
+    orjson = None
+
+# 预编译的正则表达式，避免每个文件重复查找正则缓存
+_RE_TASK = re.compile(r'^(\s*)-\s+(DONE|TODO|LATER|NOW)\s+', re.MULTILINE)
+_TASK_MAP = {'DONE': '[x]', 'TODO': '[ ]', 'LATER': '[ ]', 'NOW': '[ ]'}
+_RE_ID_PROP = re.compile(r'^\s*id::\s*.*$\n?', re.MULTILINE)
+_RE_ATTR = re.compile(r'^([a-zA-Z-]+)::\s*(.*)$', re.MULTILINE)
+_RE_SIZE_HW = re.compile(r'\{:height\s+\d+,?\s*:width\s+\d+\}')
+_RE_SIZE_WH = re.compile(r'\{:width\s+\d+,?\s*:height\s+\d+\}')
+_RE_SIZE_H = re.compile(r'\{:height\s+\d+\}')
+_RE_SIZE_W = re.compile(r'\{:width\s+\d+\}')
+_RE_BLOCKREF = re.compile(r'\(\(\([a-f0-9-]+\)\)\)')
+_RE_QUERY = re.compile(r'\{\{[^}]+\}\}')
+_RE_PAGELINK = re.compile(r'\[\[([^\]]+)\]\]')
+_RE_IMG = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+_RE_SANITIZE = re.compile(r'[<>:"/\\|?*]')
+
+# 不超过该大小（字节）的资源文件在复制时读入内存，直接写入ZIP而无需再次读取磁盘
+_ZIP_IN_MEMORY_THRESHOLD = 8 * 1024 * 1024
+
+# 读入内存、尚未写入ZIP的资源内容总量上限（字节），超出时改为由ZIP写入线程从磁盘读取
+_ZIP_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# 已经压缩过的资源格式，打包时直接存储，不再重复压缩
+_STORED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.pdf', '.mp4', '.zip'}
+
 class LogSeqToNotionConverter:
-    def __init__(self, logseq_export_path: str, output_path: str, source_name: str = None, generate_uuid: bool = False):
+    def __init__(self, logseq_export_path: str, output_path: str, source_name: str = None, generate_uuid: bool = False,
+                 verbose: bool = False, fast_links: bool = False):
         """
         初始化转换器
         
@@ -26,11 +72,16 @@ class LogSeqToNotionConverter:
             output_path: Notion格式输出根目录路径
             source_name: 指定要转换的LogSeq导出名称（如果logseq_export_path包含多个导出）
             generate_uuid: 是否生成UUID（默认为False，不生成UUID）
+            verbose: 是否将日志实时输出到终端（默认为False，只记录到转换报告）
+            fast_links: 是否使用Aho-Corasick自动机替换已知页面链接（需要安装pyahocorasick，
+                        未安装时自动退回正则表达式）
         """
         self.logseq_base_path = Path(logseq_export_path)
         self.output_base_path = Path(output_path)
         self.source_name = source_name
-        self.generate_uuid = generate_uuid
+        self.with_uuid = generate_uuid
+        self.verbose = verbose
+        self.fast_links = fast_links
         
         # 确定实际的LogSeq路径
         if source_name:
@@ -39,7 +90,7 @@ class LogSeqToNotionConverter:
                 raise ValueError(f"指定的LogSeq导出 '{source_name}' 不存在于 {logseq_export_path}")
         else:
             # 如果没有指定source_name，检查是否是直接的LogSeq导出目录
-            if (self.logseq_base_path / "pages").exists() or (self.logseq_base_path / "journals").exists():
+            if _is_logseq_export(str(self.logseq_base_path)):
                 self.logseq_path = self.logseq_base_path
                 self.source_name = self.logseq_base_path.name
             else:
@@ -64,39 +115,56 @@ class LogSeqToNotionConverter:
         # 确保输出目录存在
         self.output_path.mkdir(parents=True, exist_ok=True)
         
-        # 页面映射：LogSeq页面名 -> (Notion文件名, UUID或空字符串)
-        self.page_mapping: Dict[str, Tuple[str, str]] = {}
+        # 页面映射：LogSeq页面名 -> (Notion文件名, UUID或空字符串, URL编码后的Notion文件名)
+        self.page_mapping: Dict[str, Tuple[str, str, str]] = {}
+        
+        # 已知页面链接的Aho-Corasick自动机，首次使用时构建
+        self._link_automaton = None
+        
+        # 扫描时记录的源文件：(源文件路径, page_mapping中的key)，转换时直接复用，无需再次遍历目录
+        self.page_sources: List[Tuple[str, str]] = []
         
         # 资源文件映射
         self.asset_mapping: Dict[str, str] = {}
         
-        # 处理日志
-        self.conversion_log: List[str] = []
+        # 处理日志：(时间戳, 消息)，生成报告时再格式化
+        self.conversion_log: List[Tuple[float, str]] = []
+        
+        # 转换失败的页面源文件路径，用于转换结束时的摘要
+        self.failed_pages: List[str] = []
+        
+        # 后台ZIP写入：队列元素为 (ZIP内路径, 内容bytes或磁盘文件路径, 占用的内存预算)，None为结束标记
+        self._zip_queue: Optional[queue.Queue] = None
+        self._zip_thread: Optional[threading.Thread] = None
+        self._zip_path: Optional[Path] = None
+        self._zip_error: Optional[Exception] = None
+        
+        # 资源内容的剩余内存预算，复制线程预留、ZIP写入线程写入后归还
+        self._zip_budget = _ZIP_MEMORY_BUDGET
+        self._zip_budget_lock: Optional[threading.Lock] = threading.Lock()
         
     def list_available_exports(self) -> List[str]:
         """列出可用的LogSeq导出"""
-        if not self.logseq_base_path.exists():
-            return []
-        
-        exports = []
-        for item in self.logseq_base_path.iterdir():
-            if item.is_dir() and ((item / "pages").exists() or (item / "journals").exists()):
-                exports.append(item.name)
-        return exports
+        return _find_exports(str(self.logseq_base_path))
     
     def log(self, message: str):
         """记录转换日志"""
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
-        self.conversion_log.append(f"{datetime.now().isoformat()}: {message}")
+        timestamp = time.time()
+        self.conversion_log.append((timestamp, message))
+        if self.verbose:
+            print(f"[{time.strftime('%H:%M:%S', time.localtime(timestamp))}] {message}")
     
-    def generate_uuid(self) -> str:
-        """生成32位UUID（不带连字符）"""
-        return uuid.uuid4().hex
+    def _new_uuids(self, count: int) -> List[str]:
+        """批量生成count个32位UUID（不带连字符），一次性读取所需的全部随机字节"""
+        data = os.urandom(16 * count).hex()
+        return [data[i:i + 32] for i in range(0, len(data), 32)]
     
-    def sanitize_filename(self, filename: str) -> str:
-        """清理文件名，移除不合法字符"""
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def sanitize_filename(filename: str) -> str:
+        """清理文件名，移除不合法字符（结果会被缓存）"""
         # 移除或替换不合法字符
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        filename = _RE_SANITIZE.sub('_', filename)
         filename = filename.strip('. ')
         return filename
     
@@ -107,64 +175,122 @@ class LogSeqToNotionConverter:
     def create_notion_filename(self, page_name: str, page_uuid: str) -> str:
         """创建Notion格式的文件名"""
         clean_name = self.sanitize_filename(page_name)
-        if self.generate_uuid:
-            return f"{clean_name} {page_uuid}.md"
+        if self.with_uuid:
+            return "".join((clean_name, " ", page_uuid, ".md"))
         else:
-            return f"{clean_name}.md"
+            return clean_name + ".md"
     
     def scan_pages(self):
         """扫描所有页面并建立映射关系"""
         self.log("开始扫描页面...")
         
+        page_entries = list_markdown_files(str(self.logseq_path / "pages"))
+        journal_entries = list_markdown_files(str(self.logseq_path / "journals"))
+        
+        # 预先批量生成所有页面的UUID
+        total = len(page_entries) + len(journal_entries)
+        uuids = iter(self._new_uuids(total) if self.with_uuid else [""] * total)
+        
         # 扫描pages目录
-        pages_dir = self.logseq_path / "pages"
-        if pages_dir.exists():
-            for md_file in pages_dir.glob("*.md"):
-                page_name = self.extract_page_name(md_file)
-                page_uuid = self.generate_uuid() if self.generate_uuid else ""
-                notion_filename = self.create_notion_filename(page_name, page_uuid)
-                self.page_mapping[page_name] = (notion_filename, page_uuid)
-                self.log(f"页面映射: {page_name} -> {notion_filename}")
+        for entry in page_entries:
+            page_name = entry.name[:-3]
+            page_uuid = next(uuids)
+            notion_filename = self.create_notion_filename(page_name, page_uuid)
+            self.page_mapping[page_name] = (notion_filename, page_uuid, quote(notion_filename, safe=''))
+            self.page_sources.append((entry.path, page_name))
+            self.log(f"页面映射: {page_name} -> {notion_filename}")
         
         # 扫描journals目录
-        journals_dir = self.logseq_path / "journals"
-        if journals_dir.exists():
-            for md_file in journals_dir.glob("*.md"):
-                # 转换日期格式：2025_01_01 -> 2025年01月01日
-                date_str = md_file.stem
-                if re.match(r'\d{4}_\d{2}_\d{2}', date_str):
-                    year, month, day = date_str.split('_')
-                    page_name = f"{year}年{month}月{day}日"
-                else:
-                    page_name = date_str
-                
-                page_uuid = self.generate_uuid() if self.generate_uuid else ""
-                notion_filename = self.create_notion_filename(page_name, page_uuid)
-                self.page_mapping[date_str] = (notion_filename, page_uuid)  # 保持原文件名作为key
-                self.log(f"日记映射: {date_str} -> {notion_filename}")
+        for entry in journal_entries:
+            # 转换日期格式：2025_01_01 -> 2025年01月01日
+            date_str = entry.name[:-3]
+            if re.match(r'\d{4}_\d{2}_\d{2}', date_str):
+                year, month, day = date_str.split('_')
+                page_name = f"{year}年{month}月{day}日"
+            else:
+                page_name = date_str
+            
+            page_uuid = next(uuids)
+            notion_filename = self.create_notion_filename(page_name, page_uuid)
+            # 保持原文件名作为key
+            self.page_mapping[date_str] = (notion_filename, page_uuid, quote(notion_filename, safe=''))
+            self.page_sources.append((entry.path, date_str))
+            self.log(f"日记映射: {date_str} -> {notion_filename}")
     
-    def convert_links(self, content: str) -> str:
-        """转换LogSeq链接格式为Notion格式"""
+    def convert_links(self, content: str, missing: Optional[Set[str]] = None) -> str:
+        """转换LogSeq链接格式为Notion格式
+        
+        Args:
+            content: 页面内容
+            missing: 可选的集合，用于收集未找到的页面名（由调用方统一记录日志）
+        """
         def replace_page_link(match):
             page_name = match.group(1)
             if page_name in self.page_mapping:
-                notion_filename, _ = self.page_mapping[page_name]
-                # URL编码文件名
-                encoded_filename = quote(notion_filename, safe='')
+                # 使用扫描时预先URL编码好的文件名
+                _, _, encoded_filename = self.page_mapping[page_name]
                 return f"[{page_name}]({encoded_filename})"
             else:
                 # 如果页面不存在，保持原样或创建新页面
-                self.log(f"警告: 未找到页面 '{page_name}'，保持原链接格式")
+                if missing is not None:
+                    missing.add(page_name)
                 return f"[{page_name}](#{page_name})"
         
+        # 快速路径：一次线性扫描替换所有已知页面的链接，剩下的交给正则处理
+        automaton = self.get_link_automaton() if self.fast_links else None
+        if automaton is not None:
+            parts = []
+            last = 0
+            # 正则从scan处继续匹配；只接受正则也会在同一位置匹配的命中，
+            # 例如 [[a [[Foo]] 中的 [[Foo]] 会被正则作为 [[a [[Foo]] 的一部分匹配，不能单独替换
+            scan = 0
+            for end, (length, replacement) in automaton.iter_long(content):
+                start = end - length + 1
+                if start < scan:
+                    continue
+                match = _RE_PAGELINK.search(content, scan, end + 1)
+                while match is not None and match.end() <= start:
+                    scan = match.end()
+                    match = _RE_PAGELINK.search(content, scan, end + 1)
+                if match is None or match.start() != start:
+                    if match is not None:
+                        scan = match.end()
+                    continue
+                parts.append(content[last:start])
+                parts.append(replacement)
+                last = scan = end + 1
+            if parts:
+                parts.append(content[last:])
+                content = "".join(parts)
+        
         # 转换 [[页面名]] 格式的链接
-        content = re.sub(r'\[\[([^\]]+)\]\]', replace_page_link, content)
+        content = _RE_PAGELINK.sub(replace_page_link, content)
         
         # 转换 ![图片](路径) 格式的图片链接
         content = self.convert_image_links(content)
         
         return content
     
+    def get_link_automaton(self):
+        """构建（并缓存）匹配所有已知页面 [[页面名]] 的Aho-Corasick自动机
+        
+        未安装pyahocorasick或没有页面时返回None。
+        """
+        if ahocorasick is None or not self.page_mapping:
+            return None
+        
+        if self._link_automaton is None:
+            automaton = ahocorasick.Automaton()
+            for page_name, (_, _, encoded_filename) in self.page_mapping.items():
+                # 包含 ] 的页面名不会被正则匹配，这里保持一致
+                if ']' in page_name:
+                    continue
+                word = f"[[{page_name}]]"
+                automaton.add_word(word, (len(word), f"[{page_name}]({encoded_filename})"))
+            automaton.make_automaton()
+            self._link_automaton = automaton
+        return self._link_automaton
+    
     def convert_image_links(self, content: str) -> str:
         """转换图片链接"""
         def replace_image_link(match):
@@ -181,33 +307,35 @@ class LogSeqToNotionConverter:
             
             return match.group(0)  # 保持原样
         
-        return re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', replace_image_link, content)
+        return _RE_IMG.sub(replace_image_link, content)
     
     def convert_logseq_syntax(self, content: str) -> str:
         """转换LogSeq特有语法"""
         # 转换任务状态
-        content = re.sub(r'^(\s*)-\s+DONE\s+', r'\1- [x] ', content, flags=re.MULTILINE)
-        content = re.sub(r'^(\s*)-\s+TODO\s+', r'\1- [ ] ', content, flags=re.MULTILINE)
-        content = re.sub(r'^(\s*)-\s+LATER\s+', r'\1- [ ] ', content, flags=re.MULTILINE)
-        content = re.sub(r'^(\s*)-\s+NOW\s+', r'\1- [ ] ', content, flags=re.MULTILINE)
-        
-        # 完全移除id::相关的元数据行
-        content = re.sub(r'^\s*id::\s*.*$\n?', '', content, flags=re.MULTILINE)
+        content = _RE_TASK.sub(lambda m: f"{m.group(1)}- {_TASK_MAP[m.group(2)]} ", content)
         
-        # 移除LogSeq特有的其他属性语法（但保留id::以外的）
-        content = re.sub(r'^([a-zA-Z-]+)::\s*(.*)$', r'**\1**: \2', content, flags=re.MULTILINE)
+        # 以下语法都有固定的标记字符，先用子串查找快速排除不包含它们的页面，省去整页的正则扫描
+        if '::' in content:
+            # 完全移除id::相关的元数据行
+            content = _RE_ID_PROP.sub('', content)
+            
+            # 移除LogSeq特有的其他属性语法（但保留id::以外的）
+            content = _RE_ATTR.sub(r'**\1**: \2', content)
         
-        # 移除图片语法中的尺寸参数 {:height xxx, :width xxx}
-        content = re.sub(r'\{:height\s+\d+,?\s*:width\s+\d+\}', '', content)
-        content = re.sub(r'\{:width\s+\d+,?\s*:height\s+\d+\}', '', content)
-        content = re.sub(r'\{:height\s+\d+\}', '', content)
-        content = re.sub(r'\{:width\s+\d+\}', '', content)
+        if '{:' in content:
+            # 移除图片语法中的尺寸参数 {:height xxx, :width xxx}
+            content = _RE_SIZE_HW.sub('', content)
+            content = _RE_SIZE_WH.sub('', content)
+            content = _RE_SIZE_H.sub('', content)
+            content = _RE_SIZE_W.sub('', content)
         
-        # 转换块引用（简化处理，转换为引用格式）
-        content = re.sub(r'\(\(\([a-f0-9-]+\)\)\)', '> [引用块]', content)
+        if '(((' in content:
+            # 转换块引用（简化处理，转换为引用格式）
+            content = _RE_BLOCKREF.sub('> [引用块]', content)
         
-        # 移除查询语法（LogSeq的{{query}}）
-        content = re.sub(r'\{\{[^}]+\}\}', '<!-- LogSeq查询已移除 -->', content)
+        if '{{' in content:
+            # 移除查询语法（LogSeq的{{query}}）
+            content = _RE_QUERY.sub('<!-- LogSeq查询已移除 -->', content)
         
         return content
     
@@ -217,7 +345,7 @@ class LogSeqToNotionConverter:
         
         # 为简化处理，我们将所有页面放在同一级别
         # 你可以根据需要修改这部分来创建层级结构
-        for original_name, (notion_filename, page_uuid) in self.page_mapping.items():
+        for original_name, (notion_filename, page_uuid, _) in self.page_mapping.items():
             self.log(f"准备转换页面: {original_name}")
     
     def copy_and_convert_assets(self):
@@ -225,67 +353,109 @@ class LogSeqToNotionConverter:
         self.log("处理资源文件...")
         
         assets_dir = self.logseq_path / "assets"
-        if not assets_dir.exists():
+        if not os.path.isdir(assets_dir):
             self.log("未找到assets目录，跳过资源文件处理")
             return
         
         # 创建资源文件目录
         assets_output_dir = self.output_path / "assets"
         assets_output_dir.mkdir(exist_ok=True)
-        
-        for asset_file in assets_dir.rglob("*"):
-            if asset_file.is_file():
-                # 复制资源文件
-                dest_path = assets_output_dir / asset_file.name
-                shutil.copy2(asset_file, dest_path)
-                self.asset_mapping[str(asset_file)] = str(dest_path)
-                self.log(f"复制资源文件: {asset_file.name}")
+        assets_output_str = str(assets_output_dir)
+        
+        # 循环中直接使用DirEntry的字符串路径，不为每个文件构造Path对象
+        asset_entries = list(walk_files(str(assets_dir)))
+        
+        # 资源文件平铺到assets目录，同名文件以最后遍历到的为准，每个目标只复制一次
+        latest = {entry.name: entry.path for entry in asset_entries}
+        jobs = [(source, os.path.join(assets_output_str, name)) for name, source in latest.items()]
+        
+        # 复制是纯I/O操作，用线程池让多个文件的读写重叠进行；
+        # 每个文件复制完成后立即交给ZIP写入线程，读入内存的总量受 _ZIP_MEMORY_BUDGET 限制
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = {executor.submit(_copy_asset_for_zip, source, target, self._reserve_zip_memory): name
+                       for name, (source, target) in zip(latest, jobs)}
+            for future in as_completed(futures):
+                payload, reserved = future.result()
+                self.enqueue_zip_file("assets/" + futures[future], payload, reserved)
+        
+        for entry in asset_entries:
+            self.asset_mapping[entry.path] = os.path.join(assets_output_str, entry.name)
+            self.log(f"复制资源文件: {entry.name}")
     
-    def convert_file(self, source_path: Path, target_path: Path):
-        """转换单个文件"""
+    def convert_file(self, source_path: str, target_path: str) -> Optional[bytes]:
+        """转换单个文件，返回转换后的UTF-8内容（失败时返回None）"""
         try:
-            with open(source_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = read_page_text(source_path)
             
             # 应用各种转换
-            content = self.convert_links(content)
+            missing: Set[str] = set()
+            content = self.convert_links(content, missing)
             content = self.convert_logseq_syntax(content)
             
+            if missing:
+                preview = ", ".join(sorted(missing)[:5])
+                if len(missing) > 5:
+                    preview += "…"
+                self.log(f"警告: {os.path.basename(source_path)} 中有 {len(missing)} 个页面未找到，保持原链接格式: {preview}")
+            
             # 确保目标目录存在
-            target_path.parent.mkdir(parents=True, exist_ok=True)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
             
             # 写入转换后的内容
-            with open(target_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            data = content.encode('utf-8')
+            _write_bytes(target_path, data)
             
-            self.log(f"转换完成: {source_path.name} -> {target_path.name}")
+            self.log(f"转换完成: {os.path.basename(source_path)} -> {os.path.basename(target_path)}")
+            return data
             
         except Exception as e:
             self.log(f"转换文件失败 {source_path}: {str(e)}")
+            return None
     
     def convert_all_pages(self):
-        """转换所有页面"""
+        """转换所有页面（多进程并行）"""
         self.log("开始转换页面内容...")
         
-        # 转换pages目录
-        pages_dir = self.logseq_path / "pages"
-        if pages_dir.exists():
-            for md_file in pages_dir.glob("*.md"):
-                page_name = self.extract_page_name(md_file)
-                if page_name in self.page_mapping:
-                    notion_filename, _ = self.page_mapping[page_name]
-                    target_path = self.output_path / notion_filename
-                    self.convert_file(md_file, target_path)
-        
-        # 转换journals目录
-        journals_dir = self.logseq_path / "journals"
-        if journals_dir.exists():
-            for md_file in journals_dir.glob("*.md"):
-                date_str = md_file.stem
-                if date_str in self.page_mapping:
-                    notion_filename, _ = self.page_mapping[date_str]
-                    target_path = self.output_path / notion_filename
-                    self.convert_file(md_file, target_path)
+        # 复用scan_pages得到的文件列表，不再重复遍历pages和journals目录
+        # 多个页面映射到同一输出文件时只转换最后一个，与顺序写入时后者覆盖前者的结果一致，
+        # 同时避免不同工作进程并行写同一个文件
+        output_dir = str(self.output_path)
+        last_source: Dict[str, str] = {}
+        for source_path, key in self.page_sources:
+            last_source[self.page_mapping[key][0]] = source_path
+        filenames = list(last_source)
+        sources = list(last_source.values())
+        targets = [os.path.join(output_dir, filename) for filename in filenames]
+        
+        if not sources:
+            return
+        
+        # 工作进程只需要页面映射等配置，不携带已有的日志和资源映射
+        # （资源文件可能仍在后台线程中复制）
+        # 自动机在主进程中构建一次，随转换器副本传给工作进程，避免每个进程重复构建
+        if self.fast_links:
+            self.get_link_automaton()
+        worker_state = copy.copy(self)
+        worker_state.conversion_log = []
+        worker_state.asset_mapping = {}
+        worker_state.page_sources = []
+        worker_state._zip_queue = None
+        worker_state._zip_thread = None
+        worker_state._zip_budget_lock = None
+        
+        # 资源复制线程可能正在运行，使用spawn启动工作进程，避免fork时继承被占用的锁
+        with ProcessPoolExecutor(max_workers=pool_workers(len(sources)),
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=init_worker,
+                                 initargs=(worker_state,)) as executor:
+            results = executor.map(_convert_one, sources, targets, chunksize=16)
+            for filename, source_path, (worker_log, data) in zip(filenames, sources, results):
+                self.conversion_log.extend(worker_log)
+                if data is None:
+                    self.failed_pages.append(source_path)
+                else:
+                    # 直接把内存中的内容交给ZIP写入线程，无需再从磁盘读取
+                    self.enqueue_zip_file(filename, data)
     
     def generate_conversion_report(self):
         """生成转换报告"""
@@ -294,33 +464,109 @@ class LogSeqToNotionConverter:
             "total_pages": len(self.page_mapping),
             "page_mapping": self.page_mapping,
             "asset_mapping": self.asset_mapping,
-            "conversion_log": self.conversion_log
+            "conversion_log": [f"{datetime.fromtimestamp(timestamp).isoformat()}: {message}"
+                               for timestamp, message in self.conversion_log]
         }
         
         report_path = self.output_path / "conversion_report.json"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            data = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(report, ensure_ascii=False, indent=2).encode('utf-8')
+        _write_bytes(report_path, data)
         
+        self.enqueue_zip_file(report_path.name, data)
         self.log(f"转换报告已生成: {report_path}")
     
-    def create_zip_package(self):
-        """将转换结果打包成ZIP文件"""
+    def start_zip_writer(self):
+        """启动后台ZIP写入线程，文件生成后即可写入压缩包，与转换过程重叠进行"""
         self.log("开始创建ZIP压缩包...")
         
         # ZIP文件路径（与notion-output目录同级）
         zip_filename = f"{self.outer_output_path.name}.zip"
-        zip_path = self.outer_output_path / zip_filename
+        self._zip_path = self.outer_output_path / zip_filename
+        self._zip_error = None
+        self._zip_queue = queue.Queue()
+        self._zip_thread = threading.Thread(target=self._write_zip_entries, daemon=True)
+        self._zip_thread.start()
+    
+    def enqueue_zip_file(self, arcname: str, payload, reserved: int = 0):
+        """将文件加入ZIP写入队列（payload为bytes内容或磁盘文件路径）；未启动写入线程时忽略
+        
+        reserved为该内容通过 _reserve_zip_memory 预留的字节数，写入后归还。
+        """
+        if self._zip_queue is not None:
+            self._zip_queue.put((arcname, payload, reserved))
+        elif reserved:
+            self._release_zip_memory(reserved)
+    
+    def _reserve_zip_memory(self, size: int) -> bool:
+        """尝试为读入内存的资源内容预留size字节，预算不足时返回False（不阻塞）"""
+        with self._zip_budget_lock:
+            if size > self._zip_budget:
+                return False
+            self._zip_budget -= size
+            return True
+    
+    def _release_zip_memory(self, size: int):
+        """归还已写入ZIP的资源内容占用的内存预算"""
+        with self._zip_budget_lock:
+            self._zip_budget += size
+    
+    def _write_zip_entries(self):
+        """ZIP写入线程：从队列取出文件写入压缩包，直到收到结束标记"""
+        # 页面和资源在入队前都已按目标文件名去重（与磁盘上后写者覆盖的结果一致），
+        # 每个文件名只会入队一次，这里按收到的顺序直接写入
+        try:
+            # 文本使用最低压缩级别，速度远快于默认级别而体积相差不大
+            with zipfile.ZipFile(self._zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+                while True:
+                    item = self._zip_queue.get()
+                    if item is None:
+                        break
+                    arcname, payload, reserved = item
+                    if os.path.splitext(arcname)[1].lower() in _STORED_EXTENSIONS:
+                        compress_type = zipfile.ZIP_STORED
+                    else:
+                        compress_type = zipfile.ZIP_DEFLATED
+                    if isinstance(payload, bytes):
+                        zipf.writestr(arcname, payload, compress_type=compress_type)
+                    else:
+                        zipf.write(payload, arcname, compress_type=compress_type)
+                    if reserved:
+                        del item, payload
+                        self._release_zip_memory(reserved)
+        except Exception as e:
+            self._zip_error = e
+    
+    def _stop_zip_writer(self):
+        """发送结束标记并等待ZIP写入线程退出"""
+        if self._zip_thread is not None:
+            self._zip_queue.put(None)
+            self._zip_thread.join()
+            self._zip_queue = None
+            self._zip_thread = None
+    
+    def create_zip_package(self):
+        """将转换结果打包成ZIP文件
+        
+        如果已通过 start_zip_writer 在转换过程中写入，则只需等待写入完成；
+        否则遍历notion-output目录一次性打包。
+        """
+        if self._zip_thread is None:
+            self.start_zip_writer()
+            for file_path in self.output_path.rglob('*'):
+                if file_path.is_file():
+                    # 在ZIP中保持目录结构（相对于notion-output目录）
+                    self.enqueue_zip_file(file_path.relative_to(self.output_path).as_posix(), file_path)
+        
+        zip_path = self._zip_path
+        self._stop_zip_writer()
         
         try:
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # 遍历notion-output目录中的所有文件
-                for file_path in self.output_path.rglob('*'):
-                    if file_path.is_file():
-                        # 计算相对路径（相对于notion-output目录）
-                        relative_path = file_path.relative_to(self.output_path)
-                        # 在ZIP中保持目录结构
-                        zipf.write(file_path, relative_path)
-                        
+            if self._zip_error is not None:
+                raise self._zip_error
+            
             # 计算ZIP文件大小
             zip_size = zip_path.stat().st_size
             zip_size_mb = zip_size / (1024 * 1024)
@@ -331,6 +577,7 @@ class LogSeqToNotionConverter:
             return zip_path
             
         except Exception as e:
+            self._zip_error = e
             self.log(f"创建ZIP压缩包失败: {str(e)}")
             return None
     
@@ -343,17 +590,24 @@ class LogSeqToNotionConverter:
         self.log("=" * 50)
         
         try:
-            # 1. 扫描并映射所有页面
-            self.scan_pages()
-            
-            # 2. 创建页面层级结构
-            self.create_page_hierarchy()
-            
-            # 3. 复制和转换资源文件
-            self.copy_and_convert_assets()
+            # 启动ZIP写入线程，生成的文件会被实时加入压缩包
+            self.start_zip_writer()
             
-            # 4. 转换所有页面内容
-            self.convert_all_pages()
+            with ThreadPoolExecutor(max_workers=1) as background:
+                # 1. 在后台复制和转换资源文件，与页面转换同时进行
+                assets_future = background.submit(self.copy_and_convert_assets)
+                
+                # 2. 扫描并映射所有页面
+                self.scan_pages()
+                
+                # 3. 创建页面层级结构
+                self.create_page_hierarchy()
+                
+                # 4. 转换所有页面内容
+                self.convert_all_pages()
+                
+                # 等待资源文件复制完成
+                assets_future.result()
             
             # 5. 生成转换报告
             self.generate_conversion_report()
@@ -371,8 +625,71 @@ class LogSeqToNotionConverter:
             self.log("=" * 50)
             
         except Exception as e:
+            self._stop_zip_writer()
             self.log(f"转换过程中发生错误: {str(e)}")
             raise
+    
+    def print_summary(self):
+        """在终端输出简短的转换结果（未开启verbose时日志不会实时输出）"""
+        print(f"转换完成，输出目录: {self.outer_output_path}")
+        if self._zip_error is not None:
+            print(f"创建ZIP压缩包失败: {self._zip_error}")
+        elif self._zip_path is not None:
+            print(f"ZIP压缩包: {self._zip_path}")
+        print(f"共转换 {len(self.page_mapping)} 个页面")
+        if self.failed_pages:
+            print(f"{len(self.failed_pages)} 个页面转换失败:")
+            for source_path in self.failed_pages:
+                print(f"  - {source_path}")
+
+def _is_logseq_export(path: str) -> bool:
+    """判断目录是否为LogSeq导出（包含pages或journals子目录）"""
+    return (os.access(os.path.join(path, "pages"), os.F_OK)
+            or os.access(os.path.join(path, "journals"), os.F_OK))
+
+def _find_exports(base_path: str) -> List[str]:
+    """列出base_path下所有LogSeq导出的目录名"""
+    try:
+        with os.scandir(base_path) as it:
+            return [entry.name for entry in it
+                    if entry.is_dir() and _is_logseq_export(entry.path)]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+def _write_bytes(path: str, data: bytes):
+    """直接通过文件描述符写入全部内容，不经过TextIOWrapper"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+def _copy_asset_for_zip(source_path: str, target_path: str, reserve) -> Tuple[object, int]:
+    """复制资源文件并返回 (写入ZIP所需的内容, 预留的内存字节数)
+    
+    小文件在reserve(size)预留内存成功后读入一次，复制和打包共用同一份bytes；
+    大文件或内存预算不足时使用 copy_asset 复制，返回目标路径，由ZIP写入线程从磁盘读取。
+    """
+    size = os.path.getsize(source_path)
+    if size > _ZIP_IN_MEMORY_THRESHOLD or not reserve(size):
+        copy_asset(source_path, target_path)
+        return target_path, 0
+    
+    with open(source_path, 'rb') as f:
+        data = f.read()
+    _write_bytes(target_path, data)
+    shutil.copystat(source_path, target_path)
+    return data, size
+
+def _convert_one(source_path: str, target_path: str) -> Tuple[List[Tuple[float, str]], Optional[bytes]]:
+    """在工作进程中转换单个文件，返回该文件产生的日志和转换后的UTF-8内容"""
+    converter = worker_converter()
+    converter.conversion_log = []
+    data = converter.convert_file(source_path, target_path)
+    return converter.conversion_log, data
 
 def main():
     """主函数"""
@@ -389,20 +706,20 @@ def main():
                         help='转换所有可用的LogSeq导出')
     parser.add_argument('--with-uuid', action='store_true', 
                         help='生成UUID后缀（默认不生成，文件名更简洁）')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='实时输出详细转换日志（默认只写入转换报告）')
+    parser.add_argument('--fast-links', action='store_true',
+                        help='使用Aho-Corasick自动机加速链接替换（需要安装pyahocorasick）')
     
     args = parser.parse_args()
     
     # 列出可用导出
     if args.list:
-        base_path = Path(args.logseq_path)
-        if not base_path.exists():
+        if not os.path.exists(args.logseq_path):
             print(f"错误: 路径 {args.logseq_path} 不存在")
             return
         
-        exports = []
-        for item in base_path.iterdir():
-            if item.is_dir() and ((item / "pages").exists() or (item / "journals").exists()):
-                exports.append(item.name)
+        exports = _find_exports(args.logseq_path)
         
         if exports:
             print("可用的LogSeq导出:")
@@ -414,11 +731,7 @@ def main():
     
     # 批量转换所有导出
     if args.all:
-        base_path = Path(args.logseq_path)
-        exports = []
-        for item in base_path.iterdir():
-            if item.is_dir() and ((item / "pages").exists() or (item / "journals").exists()):
-                exports.append(item.name)
+        exports = _find_exports(args.logseq_path)
         
         if not exports:
             print("未找到任何LogSeq导出")
@@ -430,8 +743,11 @@ def main():
                 print(f"\n{'='*50}")
                 print(f"正在转换: {export_name}")
                 print(f"{'='*50}")
-                converter = LogSeqToNotionConverter(args.logseq_path, args.output_path, export_name, args.with_uuid)
+                converter = LogSeqToNotionConverter(args.logseq_path, args.output_path, export_name,
+                                                    args.with_uuid, args.verbose, args.fast_links)
                 converter.convert()
+                if not args.verbose:
+                    converter.print_summary()
             except Exception as e:
                 print(f"转换 {export_name} 时发生错误: {str(e)}")
                 continue
@@ -443,8 +759,11 @@ def main():
     
     # 单个转换
     try:
-        converter = LogSeqToNotionConverter(args.logseq_path, args.output_path, args.source_name, args.with_uuid)
+        converter = LogSeqToNotionConverter(args.logseq_path, args.output_path, args.source_name,
+                                            args.with_uuid, args.verbose, args.fast_links)
         converter.convert()
+        if not args.verbose:
+            converter.print_summary()
     except Exception as e:
         print(f"错误: {str(e)}")
         print("\n使用 --list 参数查看可用的LogSeq导出")
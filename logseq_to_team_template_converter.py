@@ -8,18 +8,71 @@ LogSeq to Team Template 转换工具
 
 import os
 import re
+import copy
+import functools
 import uuid
-import shutil
 import json
 import zipfile
 import csv
+import io
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import quote
 from datetime import datetime
 from typing import Dict, List, Set, Tuple, Optional
 
+from logseq_common import (copy_asset, init_worker, list_markdown_files, pool_workers, read_page_text,
+                           walk_files, worker_converter)
+
+try:
+    # 可选依赖：orjson，用于快速生成转换报告
+    import orjson
+except ImportError:
+    orjson = None
+
+# 预编译的正则表达式，避免每个页面重复查找正则缓存
+_PAGE_LINK = re.compile(r'\[\[([^\]]+)\]\]')
+_SANITIZE = re.compile(r'[<>:"/\\|?*]')
+_JOURNAL_UNDERSCORE = re.compile(r'\d{4}_\d{2}_\d{2}')
+_JOURNAL_CHINESE = re.compile(r'(\d{4})年(\d{2})月(\d{2})日')
+
+# 数据库CSV表头
+_CSV_HEADERS = ["名字", "开始日期", "页面类型", "结束日期", "相关成员", "Created by", "内容标签", "摘要", "状态", "进度"]
+
+# 视图CSV的文件名后缀：今日聚合、全局视角、项目管理、任务管理、会议日志、Wiki
+_VIEW_SUFFIXES = ["today", "global", "projects", "tasks", "meetings", "wiki"]
+
+# 已经压缩过的资源格式，打包时直接存储，不再重复压缩
+_STORED_EXT = {'.png', '.jpg', '.jpeg', '.gif', '.pdf', '.mp4', '.mov', '.zip', '.webp'}
+
+# 提取摘要时依次执行的替换：(正则, 替换内容)
+# 链接和图片使用有长度上限的字符类，避免格式错误的Markdown导致大量回溯
+_SUMMARY_SUBS = [
+    (re.compile(r'#+ '), ''),                                   # 移除标题
+    (re.compile(r'\*\*(.*?)\*\*'), r'\1'),                      # 移除粗体
+    (re.compile(r'\*(.*?)\*'), r'\1'),                          # 移除斜体
+    (re.compile(r'\[([^\]]{0,200})\]\([^)]{0,500}\)'), r'\1'),  # 移除链接，保留文本
+    (re.compile(r'!\[[^\]]{0,200}\]\([^)]{0,500}\)'), ''),      # 移除图片
+    (re.compile(r'`.*?`'), ''),                                 # 移除行内代码
+]
+
 class LogSeqToTeamTemplateConverter:
-    def __init__(self, source_name: str, team_name: str = "LogSeq导入团队", with_uuid: bool = False):
+    # 数据库条目模板，键顺序与CSV表头一致，值均为不可变字符串，浅拷贝即可
+    _ENTRY_TEMPLATE = {
+        "名字": "",
+        "开始日期": "",
+        "页面类型": "",
+        "结束日期": "",
+        "相关成员": "",
+        "Created by": "LogSeq导入",
+        "内容标签": "",
+        "摘要": "",
+        "状态": "Not started",
+        "进度": ""
+    }
+    
+    def __init__(self, source_name: str, team_name: str = "LogSeq导入团队", with_uuid: bool = False,
+                 verbose: bool = False):
         """
         初始化转换器
         
@@ -27,6 +80,7 @@ class LogSeqToTeamTemplateConverter:
             source_name: LogSeq导出子目录名称（在logseq-export目录下）
             team_name: 团队模板名称
             with_uuid: 是否使用UUID（默认为False）
+            verbose: 是否实时在控制台输出日志（默认只记录到转换报告）
         """
         # 默认使用固定的根目录
         self.logseq_base_path = Path("logseq-export")
@@ -34,6 +88,7 @@ class LogSeqToTeamTemplateConverter:
         self.source_name = source_name
         self.team_name = team_name
         self.with_uuid = with_uuid
+        self.verbose = verbose
         
         # 确定实际的LogSeq路径
         self.logseq_path = self.logseq_base_path / source_name
@@ -74,6 +129,10 @@ class LogSeqToTeamTemplateConverter:
         # 数据库条目列表
         self.database_entries = []
         
+        # 按页面类型统计的条目数，在添加条目时累加
+        self._journal_count = 0
+        self._article_count = 0
+        
         # 页面映射：LogSeq页面名 -> (Notion文件名, UUID)
         self.page_mapping: Dict[str, Tuple[str, str]] = {}
         
@@ -83,6 +142,19 @@ class LogSeqToTeamTemplateConverter:
         # 处理日志
         self.conversion_log: List[str] = []
         
+        # 页面名 -> 预先生成的Notion链接，页面映射完整后由 build_link_table 生成
+        self._link_table: Optional[Dict[str, str]] = None
+        
+        # 按表头顺序排列的数据库行，汇总页面后生成一次
+        self._rows: Optional[List[List[str]]] = None
+        
+        # 序列化后的数据库CSV内容，数据库和各视图共用
+        self._database_csv: Optional[bytes] = None
+        
+        # 转换过程中打开的ZIP压缩包，文件生成时即写入，由 open_zip_archive 创建
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._zip_path: Optional[Path] = None
+        
     @staticmethod
     def list_available_exports() -> List[str]:
         """列出可用的LogSeq导出"""
@@ -98,12 +170,16 @@ class LogSeqToTeamTemplateConverter:
     
     def log(self, message: str):
         """记录转换日志"""
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
-        self.conversion_log.append(f"{datetime.now().isoformat()}: {message}")
+        now = datetime.now()
+        self.conversion_log.append(f"{now.isoformat()}: {message}")
+        if self.verbose:
+            print(f"[{now.strftime('%H:%M:%S')}] {message}")
     
-    def sanitize_filename(self, filename: str) -> str:
-        """清理文件名，移除不合法字符"""
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def sanitize_filename(filename: str) -> str:
+        """清理文件名，移除不合法字符（结果会被缓存）"""
+        filename = _SANITIZE.sub('_', filename)
         filename = filename.strip('. ')
         return filename
     
@@ -126,43 +202,45 @@ class LogSeqToTeamTemplateConverter:
             return "日志"
         
         # 检查文件名模式
-        if re.match(r'\d{4}年\d{2}月\d{2}日', page_name) or re.match(r'\d{4}_\d{2}_\d{2}', page_name):
+        if _JOURNAL_CHINESE.match(page_name) or _JOURNAL_UNDERSCORE.match(page_name):
             return "日志"
         
         # 其他都标记为文章
         return "文章"
     
-    def convert_date_format(self, date_str: str) -> Tuple[str, str]:
-        """转换日期格式"""
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def convert_date_format(date_str: str) -> Tuple[str, str]:
+        """转换日期格式（结果会被缓存）"""
         # 处理 YYYY_MM_DD 格式
-        if re.match(r'\d{4}_\d{2}_\d{2}', date_str):
+        if _JOURNAL_UNDERSCORE.match(date_str):
             year, month, day = date_str.split('_')
             chinese_date = f"{year}年{month}月{day}日"
             iso_date = f"{month}/{day}/{year}"
             return chinese_date, iso_date
         
-        # 处理其他日期格式
-        if re.match(r'\d{4}年\d{2}月\d{2}日', date_str):
-            # 已经是中文格式
-            match = re.match(r'(\d{4})年(\d{2})月(\d{2})日', date_str)
-            if match:
-                year, month, day = match.groups()
-                iso_date = f"{month}/{day}/{year}"
-                return date_str, iso_date
+        # 处理其他日期格式：已经是中文格式
+        match = _JOURNAL_CHINESE.match(date_str)
+        if match:
+            year, month, day = match.groups()
+            iso_date = f"{month}/{day}/{year}"
+            return date_str, iso_date
         
         # 默认返回原始值
         return date_str, ""
     
     def extract_summary(self, content: str, max_length: int = 150) -> str:
         """从内容中提取摘要"""
+        # 线性扫描移除代码块：按 ``` 切分后只保留代码块之外的部分
+        content = ''.join(content.split('```')[::2])
+        
+        # 摘要只需要开头的内容，先截断再做正则替换；
+        # 保留摘要长度8倍的余量，链接、图片等格式被移除后仍有足够的文字
+        content = content[:max_length * 8]
+        
         # 移除markdown格式
-        content = re.sub(r'#+ ', '', content)  # 移除标题
-        content = re.sub(r'\*\*(.*?)\*\*', r'\1', content)  # 移除粗体
-        content = re.sub(r'\*(.*?)\*', r'\1', content)  # 移除斜体
-        content = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', content)  # 移除链接，保留文本
-        content = re.sub(r'!\[.*?\]\(.*?\)', '', content)  # 移除图片
-        content = re.sub(r'```.*?```', '', content, flags=re.DOTALL)  # 移除代码块
-        content = re.sub(r'`.*?`', '', content)  # 移除行内代码
+        for pattern, replacement in _SUMMARY_SUBS:
+            content = pattern.sub(replacement, content)
         
         # 清理空白和换行
         content = ' '.join(content.split())
@@ -173,25 +251,20 @@ class LogSeqToTeamTemplateConverter:
         
         return content.strip()
     
+    def build_link_table(self) -> Dict[str, str]:
+        """根据页面映射预先生成每个页面的Notion链接：页面名 -> 替换后的链接文本"""
+        # Notion文件名中已经包含UUID（如果启用），直接URL编码即可
+        return {page_name: f"[{page_name}]({quote(notion_filename)})"
+                for page_name, (notion_filename, _) in self.page_mapping.items()}
+    
     def convert_links(self, content: str) -> str:
         """转换LogSeq链接格式为Notion格式"""
-        def replace_page_link(match):
-            page_name = match.group(1)
-            if page_name in self.page_mapping:
-                notion_filename, page_uuid = self.page_mapping[page_name]
-                # 创建Notion格式的链接
-                encoded_filename = quote(notion_filename[:-3])  # 移除.md扩展名
-                if self.with_uuid and page_uuid:
-                    return f"[{page_name}]({encoded_filename}%20{page_uuid}.md)"
-                else:
-                    return f"[{page_name}]({encoded_filename}.md)"
-            else:
-                return f"[{page_name}]"
+        link_table = self._link_table
+        if link_table is None:
+            link_table = self.build_link_table()
         
-        # 转换 [[页面]] 格式的链接
-        content = re.sub(r'\[\[([^\]]+)\]\]', replace_page_link, content)
-        
-        return content
+        # 转换 [[页面]] 格式的链接，未知页面只保留文本
+        return _PAGE_LINK.sub(lambda m: link_table.get(m.group(1)) or f"[{m.group(1)}]", content)
     
     def process_assets(self):
         """处理资源文件"""
@@ -213,49 +286,123 @@ class LogSeqToTeamTemplateConverter:
             self.log(f"创建assets目录失败: {e}")
             return
         
-        for asset_file in assets_dir.rglob("*"):
-            if asset_file.is_file():
-                try:
-                    # 复制资源文件 
-                    relative_path = asset_file.relative_to(assets_dir)
-                    target_path = notion_assets_dir / relative_path
-                    
-                    self.log(f"准备复制: {asset_file} -> {target_path}")
-                    
-                    target_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(asset_file, target_path)
-                    
-                    # 建立映射
-                    self.asset_mapping[str(relative_path)] = str(target_path.relative_to(self.output_path))
-                    self.log(f"资源文件复制成功: {relative_path}")
-                except Exception as e:
-                    self.log(f"复制资源文件失败 {asset_file}: {e}")
-                    continue
+        # 循环中只使用字符串路径，不为每个文件构造Path对象
+        assets_root = os.fspath(assets_dir)
+        notion_assets_root = os.fspath(notion_assets_dir)
+        mapped_assets_root = os.fspath(notion_assets_dir.relative_to(self.output_path))
+        
+        # 收集复制任务，并预先创建所有目标目录
+        jobs: List[Tuple[str, str, str]] = []
+        target_dirs: Set[str] = set()
+        for entry in walk_files(assets_root):
+            relative_path = entry.path[len(assets_root) + 1:]
+            target_path = os.path.join(notion_assets_root, relative_path)
+            jobs.append((relative_path, entry.path, target_path))
+            target_dirs.add(os.path.dirname(target_path))
+        
+        for target_dir in target_dirs:
+            try:
+                os.makedirs(target_dir, exist_ok=True)
+            except Exception as e:
+                # 该目录下的文件复制时会失败并被记录
+                self.log(f"创建资源目录失败 {target_dir}: {e}")
+        
+        # 复制是纯I/O操作，用线程池让多个文件的读写重叠进行
+        with ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 2)) as executor:
+            errors = list(executor.map(_try_copy_asset, jobs))
+        
+        # 在当前线程中写入压缩包并建立映射
+        # 资源文件可能成千上万，不逐个记录日志，只记录失败和最终数量
+        copied = 0
+        for (relative_path, source_path, target_path), error in zip(jobs, errors):
+            if error is not None:
+                self.log(f"复制资源文件失败 {source_path}: {error}")
+                continue
+            
+            self.add_to_zip(target_path)
+            self.asset_mapping[relative_path] = os.path.join(mapped_assets_root, relative_path)
+            copied += 1
+        
+        self.log(f"资源文件复制完成: {copied} 个")
     
     def scan_and_convert_pages(self):
-        """扫描并转换所有页面"""
+        """扫描并转换所有页面（多进程并行）
+        
+        分两遍进行：第一遍读取页面、确定类型并提取摘要；汇总出完整的页面映射后，
+        第二遍重新读取页面，转换链接并写入页面文件，因为链接转换需要知道所有页面名。
+        """
         self.log("开始扫描和转换页面...")
         
-        # 处理pages目录
-        pages_dir = self.logseq_path / "pages"
-        if pages_dir.exists():
-            for md_file in pages_dir.glob("*.md"):
-                self.process_page_file(md_file)
-        
-        # 处理journals目录
-        journals_dir = self.logseq_path / "journals"
-        if journals_dir.exists():
-            for md_file in journals_dir.glob("*.md"):
-                self.process_page_file(md_file)
+        # 收集pages和journals目录下的Markdown文件路径（字符串，由工作进程再构造Path）
+        md_files = _list_page_files(os.fspath(self.logseq_path))
+        
+        if not md_files:
+            return
+        
+        # 工作进程只需要配置，不携带已有的日志和数据
+        worker_state = copy.copy(self)
+        worker_state.conversion_log = []
+        worker_state.database_entries = []
+        worker_state.asset_mapping = {}
+        worker_state.page_mapping = {}
+        worker_state._zip = None
+        
+        # 第一遍：并行读取页面并生成数据库条目
+        pages: List[Dict] = []
+        with ProcessPoolExecutor(max_workers=pool_workers(len(md_files)),
+                                 initializer=init_worker,
+                                 initargs=(worker_state,)) as executor:
+            for worker_log, page in executor.map(_process_page, md_files, chunksize=16):
+                self.conversion_log.extend(worker_log)
+                if page is not None:
+                    pages.append(page)
+        
+        # 在主进程中汇总页面映射和数据库条目
+        for page in pages:
+            self.page_mapping[page["page_name"]] = (page["filename"], page["page_uuid"])
+            self.database_entries.append(page["entry"])
+            if page["page_type"] == "日志":
+                self._journal_count += 1
+            else:
+                self._article_count += 1
+        
+        # 按表头顺序预先生成CSV行，序列化时无需再按键查找
+        self._rows = self.build_rows(self.database_entries)
+        
+        # 页面映射已完整，一次性生成所有链接
+        self._link_table = self.build_link_table()
+        
+        # 多个页面生成同名文件时只写入最后一个，与顺序写入时后者覆盖前者的结果一致，
+        # 同时避免不同工作进程并行写同一个文件
+        latest = {page["filename"]: page for page in pages}
+        if len(latest) < len(pages):
+            self.log(f"{len(pages) - len(latest)} 个页面与其他页面的文件名相同，以最后一个为准")
+        pages = list(latest.values())
+        
+        # 第二遍：带上预先生成的链接表，并行转换链接并写入页面文件
+        worker_state._link_table = self._link_table
+        with ProcessPoolExecutor(max_workers=pool_workers(len(pages)),
+                                 initializer=init_worker,
+                                 initargs=(worker_state,)) as executor:
+            for page, (worker_log, data) in zip(pages, executor.map(_write_page, pages, chunksize=16)):
+                self.conversion_log.extend(worker_log)
+                # 页面内容由工作进程返回，直接写入压缩包，无需再从磁盘读取
+                if data is not None:
+                    self.add_to_zip(self.database_dir / page["filename"], data)
     
-    def process_page_file(self, md_file: Path):
-        """处理单个页面文件"""
+    def process_page_file(self, md_file: Path) -> Optional[Dict]:
+        """读取单个页面文件，返回页面信息（不修改转换器状态，可在工作进程中调用）
+        
+        Returns:
+            包含page_name、filename、page_uuid、entry、source等字段的字典；跳过或失败时返回None
+            （页面内容不返回给主进程，写入页面时再从source重新读取）
+        """
         page_name = self.extract_page_name(md_file)
         
         # 跳过contents.md，因为它的内容已经集成到主页面中
         if page_name == "contents":
             self.log(f"跳过contents.md，其内容已集成到主页面")
-            return
+            return None
         
         page_uuid = uuid.uuid4().hex if self.with_uuid else ""
         
@@ -271,66 +418,65 @@ class LogSeqToTeamTemplateConverter:
         
         # 读取内容
         try:
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = read_page_text(md_file)
         except Exception as e:
             self.log(f"读取文件失败 {md_file}: {str(e)}")
-            return
+            return None
         
-        # 创建页面映射
         notion_filename = self.create_notion_filename(display_name, page_uuid)
-        self.page_mapping[page_name] = (notion_filename, page_uuid)
         
         # 提取摘要
         summary = self.extract_summary(content)
         
-        # 创建数据库条目
-        entry = {
-            "名字": display_name,
-            "开始日期": start_date,
-            "页面类型": page_type,
-            "结束日期": "",
-            "相关成员": "",
-            "Created by": "LogSeq导入",
-            "内容标签": "",
-            "摘要": summary,
-            "状态": "Not started",
-            "进度": ""
+        # 创建数据库条目：复制模板后只填写随页面变化的字段
+        entry = self._ENTRY_TEMPLATE.copy()
+        entry["名字"] = display_name
+        entry["开始日期"] = start_date
+        entry["页面类型"] = page_type
+        entry["摘要"] = summary
+        
+        return {
+            "page_name": page_name,
+            "display_name": display_name,
+            "filename": notion_filename,
+            "page_uuid": page_uuid,
+            "page_type": page_type,
+            "start_date": start_date,
+            "summary": summary,
+            "source": os.fspath(md_file),
+            "entry": entry,
         }
-        
-        self.database_entries.append(entry)
-        
-        # 创建Notion格式的页面文件
-        self.create_notion_page(notion_filename, page_uuid, display_name, page_type, start_date, content, summary)
-        
-        self.log(f"转换页面: {page_name} -> {display_name} ({page_type})")
     
-    def create_notion_page(self, filename: str, page_uuid: str, page_name: str, page_type: str, start_date: str, content: str, summary: str):
-        """创建Notion格式的页面文件"""
-        notion_content = f"# {page_name}\n\n"
+    def create_notion_page(self, filename: str, page_uuid: str, page_name: str, page_type: str, start_date: str, content: str, summary: str) -> Optional[bytes]:
+        """创建Notion格式的页面文件，返回写入的内容（失败时返回None）"""
+        # 转换链接格式
+        converted_content = self.convert_links(content)
         
-        # 添加属性
-        notion_content += f"Created by: LogSeq导入\n"
+        # 标题和属性收集到列表中一次性拼接；正文单独编码，不再和页头拼成完整的字符串
+        parts = [f"# {page_name}\n\n", "Created by: LogSeq导入\n"]
         if start_date:
-            notion_content += f"开始日期: {start_date}\n"
-        notion_content += f"状态: Not started\n"
-        notion_content += f"页面类型: {page_type}\n"
+            parts.append(f"开始日期: {start_date}\n")
+        parts += ["状态: Not started\n", f"页面类型: {page_type}\n"]
         if summary:
-            notion_content += f"摘要: {summary}\n"
-        
-        notion_content += "\n---\n\n"
-        
-        # 转换链接格式
-        converted_content = self.convert_links(content)
-        notion_content += converted_content
+            parts.append(f"摘要: {summary}\n")
+        parts.append("\n---\n\n")
         
-        # 写入文件
         page_path = self.database_dir / filename
         try:
-            with open(page_path, 'w', encoding='utf-8') as f:
-                f.write(notion_content)
+            header = ''.join(parts).encode('utf-8')
+            body = converted_content.encode('utf-8')
+            # 页头和正文依次写入文件
+            with open(page_path, 'wb') as f:
+                f.write(header)
+                f.write(body)
         except Exception as e:
             self.log(f"写入页面文件失败 {filename}: {str(e)}")
+            return None
+        
+        # 压缩包需要完整内容，只在这里拼接一次
+        data = header + body
+        self.add_to_zip(page_path, data)
+        return data
     
     def create_database_csv(self):
         """创建数据库CSV文件"""
@@ -338,14 +484,10 @@ class LogSeqToTeamTemplateConverter:
         
         csv_path = self.main_page_dir / f"{self.database_name}.csv"
         
-        # CSV表头
-        headers = ["名字", "开始日期", "页面类型", "结束日期", "相关成员", "Created by", "内容标签", "摘要", "状态", "进度"]
-        
         try:
-            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
-                writer.writerows(self.database_entries)
+            self._database_csv = self.serialize_csv(self.get_rows())
+            csv_path.write_bytes(self._database_csv)
+            self.add_to_zip(csv_path, self._database_csv)
             
             self.log(f"数据库CSV创建完成: {len(self.database_entries)} 条记录")
         except Exception as e:
@@ -356,10 +498,9 @@ class LogSeqToTeamTemplateConverter:
         contents_path = self.logseq_path / "pages" / "contents.md"
         if contents_path.exists():
             try:
-                with open(contents_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # 转换链接格式
-                    return self.convert_links(content)
+                content = read_page_text(contents_path)
+                # 转换链接格式
+                return self.convert_links(content)
             except Exception as e:
                 self.log(f"读取contents.md失败: {e}")
                 return ""
@@ -375,6 +516,9 @@ class LogSeqToTeamTemplateConverter:
         # 编码数据库名称用于链接
         encoded_db_name = quote(self.database_name)
         
+        # 导入、创建和最后修改时间使用同一个时间戳
+        now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
         # 构建主页面内容，contents内容在前面
         main_content = f"""# {self.team_name}
 
@@ -386,7 +530,7 @@ class LogSeqToTeamTemplateConverter:
 💡
 
 模板版本：LogSeq导入-v1.0
-导入时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+导入时间：{now_str}
 
 </aside>
 
@@ -433,9 +577,9 @@ class LogSeqToTeamTemplateConverter:
 <aside>
 📅
 
-创建时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+创建时间：{now_str}
 
-最后修改时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+最后修改时间：{now_str}
 
 </aside>
 
@@ -485,16 +629,17 @@ class LogSeqToTeamTemplateConverter:
 ## 导入统计
 
 - 总记录数：{len(self.database_entries)}
-- 日志条目：{len([e for e in self.database_entries if e['页面类型'] == '日志'])}
-- 文章条目：{len([e for e in self.database_entries if e['页面类型'] == '文章'])}
+- 日志条目：{self._journal_count}
+- 文章条目：{self._article_count}
 - 导入源：{self.source_name}
 """
         
         # 写入主页面文件
         main_page_path = self.output_path / f"{self.main_page_name}.md"
         try:
-            with open(main_page_path, 'w', encoding='utf-8') as f:
-                f.write(main_content)
+            data = main_content.encode('utf-8')
+            main_page_path.write_bytes(data)
+            self.add_to_zip(main_page_path, data)
             self.log("主页面创建完成")
         except Exception as e:
             self.log(f"创建主页面失败: {str(e)}")
@@ -503,42 +648,39 @@ class LogSeqToTeamTemplateConverter:
         """创建各种视图的CSV文件 - 按照team-template结构"""
         self.log("创建视图CSV文件...")
         
-        headers = ["名字", "开始日期", "页面类型", "结束日期", "相关成员", "Created by", "内容标签", "摘要", "状态", "进度"]
-        
-        # 今日聚合视图
-        today_entries = self.database_entries
-        self.write_csv(f"{self.database_name}_today.csv", headers, today_entries)
-        
-        # 全局视角
-        global_entries = self.database_entries
-        self.write_csv(f"{self.database_name}_global.csv", headers, global_entries)
-        
-        # 项目管理视图（目前所有条目都当作项目处理）
-        project_entries = self.database_entries
-        self.write_csv(f"{self.database_name}_projects.csv", headers, project_entries)
-        
-        # 任务管理视图
-        task_entries = self.database_entries
-        self.write_csv(f"{self.database_name}_tasks.csv", headers, task_entries)
+        # 目前各视图包含相同的条目，CSV只序列化一次，写入所有视图文件
+        if self._database_csv is None:
+            self._database_csv = self.serialize_csv(self.get_rows())
         
-        # 会议日志视图
-        meeting_entries = self.database_entries
-        self.write_csv(f"{self.database_name}_meetings.csv", headers, meeting_entries)
-        
-        # Wiki视图
-        wiki_entries = self.database_entries
-        self.write_csv(f"{self.database_name}_wiki.csv", headers, wiki_entries)
+        for suffix in _VIEW_SUFFIXES:
+            self.write_csv(f"{self.database_name}_{suffix}.csv", self._database_csv)
         
         self.log("所有视图CSV创建完成")
     
-    def write_csv(self, filename: str, headers: List[str], entries: List[Dict]):
+    def build_rows(self, entries: List[Dict]) -> List[List[str]]:
+        """将数据库条目转换为按表头顺序排列的行"""
+        return [[entry[key] for key in _CSV_HEADERS] for entry in entries]
+    
+    def get_rows(self) -> List[List[str]]:
+        """获取数据库行，尚未生成时根据当前条目生成"""
+        if self._rows is None:
+            self._rows = self.build_rows(self.database_entries)
+        return self._rows
+    
+    def serialize_csv(self, rows: List[List[str]]) -> bytes:
+        """将数据库行序列化为UTF-8编码的CSV内容"""
+        buffer = io.StringIO(newline='')
+        writer = csv.writer(buffer)
+        writer.writerow(_CSV_HEADERS)
+        writer.writerows(rows)
+        return buffer.getvalue().encode('utf-8')
+    
+    def write_csv(self, filename: str, data: bytes):
         """写入CSV文件"""
         csv_path = self.main_page_dir / filename
         try:
-            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
-                writer.writerows(entries)
+            csv_path.write_bytes(data)
+            self.add_to_zip(csv_path, data)
         except Exception as e:
             self.log(f"写入CSV文件失败 {filename}: {str(e)}")
     
@@ -549,8 +691,8 @@ class LogSeqToTeamTemplateConverter:
             "source_name": self.source_name,
             "team_name": self.team_name,
             "total_entries": len(self.database_entries),
-            "journal_entries": len([e for e in self.database_entries if e['页面类型'] == '日志']),
-            "article_entries": len([e for e in self.database_entries if e['页面类型'] == '文章']),
+            "journal_entries": self._journal_count,
+            "article_entries": self._article_count,
             "main_page_name": self.main_page_name,
             "database_name": self.database_name,
             "conversion_log": self.conversion_log
@@ -558,28 +700,62 @@ class LogSeqToTeamTemplateConverter:
         
         report_path = self.output_path / "conversion_report.json"
         try:
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                data = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(report, ensure_ascii=False, indent=2).encode('utf-8')
+            report_path.write_bytes(data)
+            self.add_to_zip(report_path, data)
             self.log("转换报告创建完成")
         except Exception as e:
             self.log(f"创建转换报告失败: {str(e)}")
     
-    def create_zip_archive(self):
-        """创建ZIP压缩包"""
-        self.log("创建ZIP压缩包...")
+    def open_zip_archive(self):
+        """打开ZIP压缩包，之后生成的文件在写入磁盘的同时写入压缩包"""
+        self._zip_path = self.outer_output_path / f"{self.source_name}-team-template.zip"
+        try:
+            self._zip = zipfile.ZipFile(self._zip_path, 'w', zipfile.ZIP_DEFLATED)
+        except Exception as e:
+            self._zip = None
+            self.log(f"创建ZIP压缩包失败: {str(e)}")
+    
+    def add_to_zip(self, file_path, data: Optional[bytes] = None):
+        """将输出文件写入ZIP压缩包；传入data时直接写入内容，否则从file_path读取
         
-        zip_path = self.outer_output_path / f"{self.source_name}-team-template.zip"
+        未打开压缩包时（如在工作进程中）忽略。
+        """
+        if self._zip is None:
+            return
+        
+        file_path = os.fspath(file_path)
+        arcname = os.path.relpath(file_path, self.output_path).replace(os.sep, '/')
+        
+        # 已压缩的资源直接存储；文本使用最低压缩级别，速度快得多而体积相差不大
+        if os.path.splitext(file_path)[1].lower() in _STORED_EXT:
+            options = {'compress_type': zipfile.ZIP_STORED}
+        else:
+            options = {'compress_type': zipfile.ZIP_DEFLATED, 'compresslevel': 1}
         
         try:
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in self.output_path.rglob('*'):
-                    if file_path.is_file():
-                        arcname = file_path.relative_to(self.output_path)
-                        zipf.write(file_path, arcname)
-            
-            self.log(f"ZIP压缩包创建完成: {zip_path}")
+            if data is None:
+                self._zip.write(file_path, arcname, **options)
+            else:
+                self._zip.writestr(arcname, data, **options)
+        except Exception as e:
+            self.log(f"写入ZIP压缩包失败 {arcname}: {str(e)}")
+    
+    def close_zip_archive(self):
+        """关闭ZIP压缩包，完成写入"""
+        if self._zip is None:
+            return
+        
+        try:
+            self._zip.close()
+            self.log(f"ZIP压缩包创建完成: {self._zip_path}")
         except Exception as e:
             self.log(f"创建ZIP压缩包失败: {str(e)}")
+        finally:
+            self._zip = None
     
     def convert(self):
         """执行转换"""
@@ -591,6 +767,9 @@ class LogSeqToTeamTemplateConverter:
         self.log("="*50)
         
         try:
+            # 打开ZIP压缩包，各文件生成时同步写入
+            self.open_zip_archive()
+            
             # 处理资源文件
             self.process_assets()
             
@@ -609,21 +788,58 @@ class LogSeqToTeamTemplateConverter:
             # 创建转换报告
             self.create_conversion_report()
             
-            # 创建ZIP压缩包
-            self.create_zip_archive()
+            # 完成ZIP压缩包
+            self.close_zip_archive()
             
             self.log("="*50)
             self.log("转换完成！")
             self.log(f"输出目录: {self.outer_output_path}")
             self.log(f"总条目数: {len(self.database_entries)}")
-            self.log(f"日志条目: {len([e for e in self.database_entries if e['页面类型'] == '日志'])}")
-            self.log(f"文章条目: {len([e for e in self.database_entries if e['页面类型'] == '文章'])}")
+            self.log(f"日志条目: {self._journal_count}")
+            self.log(f"文章条目: {self._article_count}")
             self.log("="*50)
             
         except Exception as e:
+            self.close_zip_archive()
             self.log(f"转换过程中发生错误: {str(e)}")
             raise
 
+def _process_page(md_file: str) -> Tuple[List[str], Optional[Dict]]:
+    """第一遍：在工作进程中读取单个页面，返回日志和页面信息"""
+    converter = worker_converter()
+    converter.conversion_log = []
+    page = converter.process_page_file(Path(md_file))
+    return converter.conversion_log, page
+
+def _write_page(page: Dict) -> Tuple[List[str], Optional[bytes]]:
+    """第二遍：在工作进程中转换链接并写入单个页面，返回日志和页面内容"""
+    converter = worker_converter()
+    converter.conversion_log = []
+    try:
+        content = read_page_text(page["source"])
+    except Exception as e:
+        converter.log(f"读取文件失败 {page['source']}: {str(e)}")
+        return converter.conversion_log, None
+    data = converter.create_notion_page(page["filename"], page["page_uuid"], page["display_name"], page["page_type"],
+                                 page["start_date"], content, page["summary"])
+    converter.log(f"转换页面: {page['page_name']} -> {page['display_name']} ({page['page_type']})")
+    return converter.conversion_log, data
+
+def _list_page_files(logseq_root: str) -> List[str]:
+    """列出pages和journals目录下所有Markdown文件的路径，每个目录只扫描一次"""
+    return [entry.path
+            for dirname in ("pages", "journals")
+            for entry in list_markdown_files(os.path.join(logseq_root, dirname))]
+
+def _try_copy_asset(job: Tuple[str, str, str]) -> Optional[Exception]:
+    """在线程池中复制单个资源文件，返回发生的异常（成功时返回None）"""
+    _, source_path, target_path = job
+    try:
+        copy_asset(source_path, target_path)
+    except Exception as e:
+        return e
+    return None
+
 def main():
     import argparse
     
@@ -632,6 +848,7 @@ def main():
     parser.add_argument("-t", "--team-name", default="LogSeq导入团队", help="团队模板名称")
     parser.add_argument("--with-uuid", action="store_true", help="使用UUID（默认不使用）")
     parser.add_argument("--list", action="store_true", help="列出可用的LogSeq导出")
+    parser.add_argument("-v", "--verbose", action="store_true", help="实时输出详细转换日志")
     
     args = parser.parse_args()
     
@@ -649,8 +866,9 @@ def main():
     
     # 执行转换
     try:
-        converter = LogSeqToTeamTemplateConverter(args.source_name, args.team_name, args.with_uuid)
+        converter = LogSeqToTeamTemplateConverter(args.source_name, args.team_name, args.with_uuid, args.verbose)
         converter.convert()
+        print(f"转换完成，输出目录: {converter.outer_output_path}")
     except Exception as e:
         print(f"错误: {str(e)}")
         print("\n使用 --list 参数查看可用的LogSeq导出")
@@ -20,6 +20,8 @@ def main():
                         help='Notion导入根目录路径 (默认: notion-output)')
     parser.add_argument('--with-uuid', action='store_true',
                         help='生成UUID后缀（默认不生成，文件名更简洁）')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='实时输出详细转换日志')
     
     args = parser.parse_args()
     
@@ -28,6 +30,7 @@ def main():
     notion_output_path = args.output_path
     source_name = args.source_name
     generate_uuid = args.with_uuid
+    verbose = args.verbose
     
     print("🚀 LogSeq到Notion快速转换工具")
     print(f"📁 LogSeq导出根目录: {logseq_export_path}")
@@ -42,7 +45,8 @@ def main():
             logseq_export_path, 
             notion_output_path, 
             source_name, 
-            generate_uuid
+            generate_uuid,
+            verbose
         )
         
         print(f"🔄 开始转换: {source_name}")